@@ -0,0 +1,77 @@
+import argparse
+import glob
+import os
+import time
+
+import report_io
+
+
+def collect(patterns):
+    """Load every existing report file matched by ``patterns``."""
+    payloads = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if not path.endswith(tuple(report_io.FORMATS.values())):
+                continue
+            payloads.append((path, report_io.load(path)))
+    return payloads
+
+
+def available_formats():
+    formats = []
+    for fmt in report_io.FORMATS:
+        try:
+            report_io.encode({}, fmt)
+        except RuntimeError as e:
+            print(f"Skipping {fmt}: {e}")
+            continue
+        formats.append(fmt)
+    return formats
+
+
+def bench(payloads, fmt, repeat):
+    """Best-of-``repeat`` encode and decode times (seconds) and total size (bytes) over all payloads."""
+    write_best = read_best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        blobs = [report_io.encode(obj, fmt) for _, obj in payloads]
+        write_best = min(write_best, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for blob in blobs:
+            report_io.decode(blob)
+        read_best = min(read_best, time.perf_counter() - started)
+        size = sum(len(blob) for blob in blobs)
+    return write_best, read_best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare report serialization formats on the real report data.')
+    parser.add_argument('patterns', nargs='*',
+                        default=['weekly_report/**/data.*', 'reports/*_raw.*'],
+                        help='Glob patterns of report files to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per format; the best time is reported')
+    args = parser.parse_args()
+
+    groups = {}
+    for pattern in args.patterns:
+        payloads = collect([pattern])
+        if payloads:
+            groups[pattern] = payloads
+    if not groups:
+        print("No report files found")
+        return
+
+    formats = available_formats()
+    for pattern, payloads in groups.items():
+        on_disk = sum(os.path.getsize(path) for path, _ in payloads)
+        print(f"\n{pattern}: {len(payloads)} files, {on_disk / 1024:.0f} KB on disk")
+        print(f"{'format':<12} {'size KB':>9} {'ratio':>6} {'write ms':>9} {'read ms':>9}")
+        for fmt in formats:
+            write_s, read_s, size = bench(payloads, fmt, args.repeat)
+            print(f"{fmt:<12} {size / 1024:>9.0f} {size / on_disk:>6.2f} {write_s * 1000:>9.1f} {read_s * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
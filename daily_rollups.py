@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+# Windows (in days) shown as trends on the weekly report
+TREND_WINDOWS = (7, 30, 90)
+
+COUNTERS = ('prs_opened', 'prs_closed', 'issues_opened', 'issues_closed')
+
+
+def empty_partition():
+    return {
+        'prs_opened': 0,
+        'prs_closed': 0,
+        'issues_opened': 0,
+        'issues_closed': 0,
+        # Authors of the PRs opened or closed that day
+        'contributors': [],
+        # time_to_first_response (hours) of the PRs and issues opened that day
+        'pr_response_hours': [],
+        'issue_response_hours': [],
+    }
+
+
+def build_partitions(history, days):
+    """Daily partitions for ``days`` ('YYYY-MM-DD') from the items opened or closed on them.
+
+    Every PR and issue counts on the day it was opened and the day it was
+    closed, whatever its current state, so a day's partition only depends on
+    the items that were opened or closed on it.
+    """
+    partitions = {day: empty_partition() for day in days}
+    contributors = {day: set() for day in days}
+    for endpoint, kind in (('pulls', 'prs'), ('issues', 'issues')):
+        for item in history.get(endpoint, []):
+            author = (item.get('user') or {}).get('login')
+            opened = (item.get('created_at') or '')[:10]
+            closed = (item.get('closed_at') or '')[:10]
+            if opened in partitions:
+                partitions[opened][f'{kind}_opened'] += 1
+                if item.get('time_to_first_response') is not None:
+                    partitions[opened][f'{kind[:-1]}_response_hours'].append(item['time_to_first_response'])
+                if kind == 'prs' and author:
+                    contributors[opened].add(author)
+            if closed in partitions:
+                partitions[closed][f'{kind}_closed'] += 1
+                if kind == 'prs' and author:
+                    contributors[closed].add(author)
+    for day, authors in contributors.items():
+        partitions[day]['contributors'] = sorted(authors)
+    return partitions
+
+
+def refresh(store, repo):
+    """Recompute the partitions of the days whose items changed since the last refresh.
+
+    The store marks the days an item was opened or closed on (before and
+    after each update) as dirty; only those days are rebuilt, every other
+    day's partition is left as it is. Returns the number of days recomputed.
+    """
+    days = store.dirty_days(repo)
+    if not days:
+        return 0
+    store.upsert_rollups(repo, build_partitions(store.items_on_days(repo, days), days))
+    return len(days)
+
+
+def merge(partitions):
+    """Combine daily partitions into one window summary.
+
+    Counters add up; contributors are the union of the daily sets and the
+    average response is taken over all samples, so merging never double
+    counts an author or averages averages.
+    """
+    totals = dict.fromkeys(COUNTERS, 0)
+    contributors = set()
+    pr_samples, issue_samples = [], []
+    for part in partitions:
+        for key in COUNTERS:
+            totals[key] += part[key]
+        contributors.update(part['contributors'])
+        pr_samples.extend(part['pr_response_hours'])
+        issue_samples.extend(part['issue_response_hours'])
+    totals['contributors'] = len(contributors)
+    totals['avg_pr_response_hours'] = round(sum(pr_samples) / len(pr_samples), 1) if pr_samples else None
+    totals['avg_issue_response_hours'] = round(sum(issue_samples) / len(issue_samples), 1) if issue_samples else None
+    return totals
+
+
+def window(store, repo, end_day, days):
+    """Summary of the ``days`` days ending with ``end_day`` (a date), plus its per-day stats.
+
+    ``daily`` maps every day of the window to the counts and contributor
+    count of that day, in the shape of ``compute_metrics``' aggregated stats.
+    """
+    first = end_day - timedelta(days=days - 1)
+    stored = store.rollups(repo, first.isoformat(), end_day.isoformat())
+    parts = [stored.get((first + timedelta(days=k)).isoformat()) or empty_partition() for k in range(days)]
+    summary = merge(parts)
+    summary.update(start=first.isoformat(), end=end_day.isoformat(), days=days)
+    summary['daily'] = {
+        (first + timedelta(days=k)).isoformat(): {
+            **{key: part[key] for key in COUNTERS},
+            'contributors': len(part['contributors']),
+        }
+        for k, part in enumerate(parts)
+    }
+    return summary
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+import time
+
+from file_lock import atomic_write
+
+
+class DiskLRU:
+    """Size-capped directory of JSON entry files, evicting the least recently used.
+
+    Shared by the on-disk caches. Keeps the size and last use of every
+    ``.json`` file in ``directory``; the file mtime doubles as the LRU
+    timestamp, so the order survives restarts. Entries are written
+    atomically, and once the directory grows past ``max_bytes`` the least
+    recently used files are removed.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # path -> (size, last used)
+        self._index = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.json'):
+                st = entry.stat()
+                self._index[entry.path] = (st.st_size, st.st_mtime)
+        self.total = sum(size for size, _ in self._index.values())
+
+    def path(self, name):
+        return os.path.join(self.directory, name + '.json')
+
+    def touch(self, path):
+        """Mark ``path`` as just used."""
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if path in self._index:
+                self._index[path] = (self._index[path][0], now)
+
+    def write(self, path, obj):
+        """Atomically write ``obj`` as JSON to ``path``, then evict; returns the number of entries evicted."""
+        atomic_write(path, json.dumps(obj, ensure_ascii=False))
+
+        size = os.path.getsize(path)
+        with self._lock:
+            old_size, _ = self._index.get(path, (0, 0))
+            self._index[path] = (size, time.time())
+            self.total += size - old_size
+            return self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the directory fits ``max_bytes``. Lock held."""
+        evicted = 0
+        if self.total <= self.max_bytes:
+            return evicted
+        for path, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self.total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._index[path]
+            self.total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,281 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# Endpoints stored as entity tables, plus the sub-resources stored per item
+ENDPOINTS = ('pulls', 'issues')
+SUBRESOURCES = ('comments', 'reviews')
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    state TEXT,
+    author TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS {table}_created ON {table} (repo, created_at);
+CREATE INDEX IF NOT EXISTS {table}_closed ON {table} (repo, closed_at);
+CREATE INDEX IF NOT EXISTS {table}_updated ON {table} (repo, updated_at);
+'''
+
+SUBRESOURCE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    repo TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    author TEXT,
+    created_at TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (repo, id)
+);
+CREATE INDEX IF NOT EXISTS {table}_number ON {table} (repo, number, created_at);
+'''
+
+CURSOR_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    repo TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    high_water TEXT NOT NULL,
+    PRIMARY KEY (repo, endpoint)
+);
+'''
+
+ROLLUP_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    repo TEXT NOT NULL,
+    day TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (repo, day)
+);
+CREATE TABLE IF NOT EXISTS rollup_dirty_days (
+    repo TEXT NOT NULL,
+    day TEXT NOT NULL,
+    PRIMARY KEY (repo, day)
+);
+'''
+
+
+def to_iso(dt):
+    return dt.strftime(ISO_FORMAT)
+
+
+class EntityStore:
+    """Local SQLite store of PRs, issues, comments and reviews keyed by repo and number.
+
+    Items are upserted as they are fetched, so any date window can be answered
+    from disk. ``sync_cursors`` keeps the per-repo high-water mark (newest
+    ``updated_at`` seen) used by incremental syncs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # --shard processes share the store: wait for each other's write transactions
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            for table in ENDPOINTS:
+                self._conn.executescript(SCHEMA.format(table=table))
+            for table in SUBRESOURCES:
+                self._conn.executescript(SUBRESOURCE_SCHEMA.format(table=table))
+            self._conn.executescript(CURSOR_SCHEMA)
+            self._conn.executescript(ROLLUP_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------ sync cursors
+    def cutoff(self, repo, endpoint, start_date):
+        """Oldest ``updated_at`` a fetch of ``endpoint`` still has to reach."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT high_water FROM sync_cursors WHERE repo = ? AND endpoint = ?', (repo, endpoint)
+            ).fetchone()
+        if not row:
+            return start_date
+        return max(datetime.fromisoformat(row[0][:-1]), start_date)
+
+    def advance(self, repo, endpoint):
+        """Move the high-water mark to the newest stored item.
+
+        Called only once a fetch stream completed, so a failed run never
+        skips items it did not actually receive.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(f'''
+                INSERT INTO sync_cursors (repo, endpoint, high_water)
+                SELECT ?, ?, MAX(updated_at) FROM {endpoint} WHERE repo = ? AND updated_at IS NOT NULL
+                HAVING MAX(updated_at) IS NOT NULL
+                ON CONFLICT (repo, endpoint) DO UPDATE SET high_water = MAX(high_water, excluded.high_water)
+            ''', (repo, endpoint, repo))
+
+    def reset_cursor(self, repo):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM sync_cursors WHERE repo = ?', (repo,))
+
+    # ------------------------------------------------------------------ items
+    def upsert_items(self, repo, endpoint, items):
+        rows = [
+            (repo, i['number'], i.get('state'), (i.get('user') or {}).get('login'),
+             i.get('created_at'), i.get('updated_at'), i.get('closed_at'), json.dumps(i))
+            for i in items
+        ]
+        with self._lock, self._conn:
+            # The days an item was opened/closed on before and after the update need new rollups
+            self._conn.executemany(f'''
+                INSERT OR IGNORE INTO rollup_dirty_days (repo, day)
+                SELECT repo, substr(created_at, 1, 10) FROM {endpoint} WHERE repo = ? AND number = ? AND created_at IS NOT NULL
+                UNION SELECT repo, substr(closed_at, 1, 10) FROM {endpoint} WHERE repo = ? AND number = ? AND closed_at IS NOT NULL
+            ''', [(repo, i['number'], repo, i['number']) for i in items])
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO rollup_dirty_days (repo, day) VALUES (?, ?)',
+                [(repo, ts[:10]) for i in items for ts in (i.get('created_at'), i.get('closed_at')) if ts],
+            )
+            self._conn.executemany(f'''
+                INSERT INTO {endpoint} (repo, number, state, author, created_at, updated_at, closed_at, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (repo, number) DO UPDATE SET
+                    state = excluded.state, author = excluded.author, created_at = excluded.created_at,
+                    updated_at = excluded.updated_at, closed_at = excluded.closed_at, payload = excluded.payload
+            ''', rows)
+
+    def get_item(self, repo, endpoint, number):
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT payload FROM {endpoint} WHERE repo = ? AND number = ?', (repo, number)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _query(self, sql, params):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def window(self, repo, start_date, end_date):
+        """Return the open/closed PRs and issues of ``repo`` for a date window.
+
+        Open items are those still open and updated during the window; closed
+        items are those closed during it. Each list is newest first.
+        """
+        start, end = to_iso(start_date), to_iso(end_date)
+        result = {}
+        for endpoint in ENDPOINTS:
+            result[f'open_{endpoint}'] = self._query(f'''
+                SELECT payload FROM {endpoint}
+                WHERE repo = ? AND state = 'open' AND updated_at BETWEEN ? AND ?
+                ORDER BY updated_at DESC
+            ''', (repo, start, end))
+            result[f'closed_{endpoint}'] = self._query(f'''
+                SELECT payload FROM {endpoint}
+                WHERE repo = ? AND state = 'closed' AND closed_at BETWEEN ? AND ?
+                ORDER BY closed_at DESC
+            ''', (repo, start, end))
+        return result
+
+    def history(self, repo, since):
+        """Every PR and issue of ``repo`` created or closed since ``since``, or still open, per endpoint.
+
+        Used by backfills, which bucket the items into weeks in one pass
+        instead of querying a window per week.
+        """
+        since = to_iso(since)
+        return {
+            endpoint: self._query(f'''
+                SELECT payload FROM {endpoint}
+                WHERE repo = ? AND (created_at >= ? OR closed_at >= ? OR closed_at IS NULL)
+            ''', (repo, since, since))
+            for endpoint in ENDPOINTS
+        }
+
+    # ----------------------------------------------------------- daily rollups
+    def dirty_days(self, repo):
+        """Days ('YYYY-MM-DD') whose rollup is missing or out of date.
+
+        A repository without any rollup yet (e.g. a store filled before
+        rollups existed) reports every day it has activity on.
+        """
+        with self._lock:
+            if not self._conn.execute('SELECT 1 FROM daily_rollups WHERE repo = ? LIMIT 1', (repo,)).fetchone():
+                rows = []
+                for endpoint in ENDPOINTS:
+                    rows += self._conn.execute(f'''
+                        SELECT substr(created_at, 1, 10) FROM {endpoint} WHERE repo = ? AND created_at IS NOT NULL
+                        UNION SELECT substr(closed_at, 1, 10) FROM {endpoint} WHERE repo = ? AND closed_at IS NOT NULL
+                    ''', (repo, repo)).fetchall()
+            else:
+                rows = self._conn.execute('SELECT day FROM rollup_dirty_days WHERE repo = ?', (repo,)).fetchall()
+        return sorted({r[0] for r in rows})
+
+    def items_on_days(self, repo, days):
+        """PRs and issues of ``repo`` opened or closed on any of ``days``, per endpoint."""
+        result = {}
+        for endpoint in ENDPOINTS:
+            items = {}
+            for day in days:
+                bounds = (repo, f'{day}T00:00:00Z', f'{day}T23:59:59Z')
+                for column in ('created_at', 'closed_at'):
+                    for item in self._query(f'''
+                        SELECT payload FROM {endpoint} WHERE repo = ? AND {column} BETWEEN ? AND ?
+                    ''', bounds):
+                        items[item['number']] = item
+            result[endpoint] = list(items.values())
+        return result
+
+    def upsert_rollups(self, repo, partitions):
+        """Store day -> partition and mark those days clean; other days are not touched."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO daily_rollups (repo, day, payload) VALUES (?, ?, ?)',
+                [(repo, day, json.dumps(part)) for day, part in partitions.items()],
+            )
+            self._conn.executemany(
+                'DELETE FROM rollup_dirty_days WHERE repo = ? AND day = ?',
+                [(repo, day) for day in partitions],
+            )
+
+    def rollups(self, repo, first_day, last_day):
+        """Stored partitions of ``repo`` between two days (inclusive), by day."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT day, payload FROM daily_rollups WHERE repo = ? AND day BETWEEN ? AND ?',
+                (repo, first_day, last_day),
+            ).fetchall()
+        return {day: json.loads(payload) for day, payload in rows}
+
+    # ---------------------------------------------------------- sub-resources
+    def upsert_subresource(self, repo, kind, number, entries):
+        if kind not in SUBRESOURCES or not isinstance(entries, list):
+            return
+        rows = [
+            (repo, e['id'], number, (e.get('user') or {}).get('login'),
+             e.get('created_at') or e.get('submitted_at'), json.dumps(e))
+            for e in entries if 'id' in e
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(f'''
+                INSERT INTO {kind} (repo, id, number, author, created_at, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (repo, id) DO UPDATE SET
+                    author = excluded.author, created_at = excluded.created_at, payload = excluded.payload
+            ''', rows)
+
+    def load_subresource(self, repo, kind, number):
+        return self._query(
+            f'SELECT payload FROM {kind} WHERE repo = ? AND number = ? ORDER BY created_at',
+            (repo, number),
+        )
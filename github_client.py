@@ -0,0 +1,183 @@
+import contextvars
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import RATE_LIMIT_STATUSES
+from token_pool import TokenPool
+
+# Default timeouts (connect, read) in seconds for every GitHub request
+DEFAULT_TIMEOUT = (5, 30)
+# Largest page size accepted by the GitHub REST API
+MAX_PER_PAGE = 100
+GRAPHQL_URL = 'https://api.github.com/graphql'
+
+
+class GitHubGraphQLError(Exception):
+    """Raised when a GraphQL response carries errors instead of data."""
+
+
+class GitHubClient:
+    """Shared HTTP client for all GitHub calls.
+
+    Wraps a single requests.Session so connections are pooled and kept alive
+    across requests and threads, negotiates gzip responses, applies a timeout
+    to every request and counts calls and bytes per repository.
+
+    When an ``http_cache.HTTPCache`` is given, authenticated GETs are sent as
+    conditional requests and 304 answers are served from the cache. API
+    requests are spread over a ``token_pool.TokenPool`` and paced and retried
+    by the rate limit scheduler of the token they were sent with.
+
+    ``on_response(repo, nbytes)``, when set, is called for every response
+    received (e.g. by ``run_profile.RunProfile.record_http``).
+    """
+
+    def __init__(self, tokens=None, pool_size=32, timeout=DEFAULT_TIMEOUT, cache=None, on_response=None):
+        if isinstance(tokens, str) or tokens is None:
+            tokens = [tokens]
+        self.tokens = TokenPool(tokens)
+        self.timeout = timeout
+        self.cache = cache
+        self.on_response = on_response
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/vnd.github.v3+json',
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'repo-analysis-runner',
+        })
+
+        self._lock = threading.Lock()
+        self.stats = defaultdict(lambda: {'calls': 0, 'bytes': 0})
+
+    @staticmethod
+    def _auth_headers(token):
+        if not token:
+            return {}
+        return {'Authorization': f'token {token}'}
+
+    def _record(self, repo, response):
+        with self._lock:
+            st = self.stats[repo or '-']
+            st['calls'] += 1
+            st['bytes'] += len(response.content)
+        if self.on_response is not None:
+            self.on_response(repo, len(response.content))
+
+    def _send(self, method, url, repo, resource, headers=None, **kwargs):
+        """Send an API request with the token that has the most budget left.
+
+        Rate limited responses are retried. When the token used is out of
+        budget and another one still has some, the request moves to that token
+        right away without counting as a retry; every other rate limit
+        (secondary limits, exhausted pool) waits out the scheduler's backoff.
+        """
+        attempt = 0
+        rotations = 0
+        while True:
+            token = self.tokens.checkout(resource)
+            scheduler = self.tokens.schedulers[token]
+            try:
+                scheduler.acquire(resource)
+                request_headers = dict(headers or {}, **self._auth_headers(token))
+                response = self.session.request(method, url, headers=request_headers,
+                                                timeout=self.timeout, **kwargs)
+            finally:
+                self.tokens.release(token)
+            self._record(repo, response)
+            scheduler.update(response)
+            if (response.status_code in RATE_LIMIT_STATUSES
+                    and response.headers.get('X-RateLimit-Remaining') == '0'
+                    and rotations < len(self.tokens.tokens)
+                    and self.tokens.has_spare(resource, exclude=token)):
+                # This token is spent but another still has budget: switch to it instead of waiting
+                rotations += 1
+                continue
+            if not scheduler.backoff(response, attempt):
+                return response
+            attempt += 1
+
+    def get(self, url, params=None, repo=None, authenticated=True, headers=None):
+        """GET ``url`` through the pooled session and record it against ``repo``."""
+        request_headers = dict(headers or {})
+
+        cache_key = entry = None
+        if self.cache is not None and authenticated:
+            cache_key = requests.Request('GET', url, params=params).prepare().url
+            entry = self.cache.lookup(cache_key)
+            if entry:
+                request_headers.update(self.cache.conditional_headers(entry))
+
+        if authenticated:
+            response = self._send('GET', url, repo, 'core', params=params, headers=request_headers)
+        else:
+            response = self.session.get(url, params=params, headers=request_headers, timeout=self.timeout)
+            self._record(repo, response)
+
+        if cache_key is not None:
+            if response.status_code == 304 and entry:
+                return self.cache.revalidated(cache_key, entry)
+            self.cache.store(cache_key, response)
+        return response
+
+    def get_json(self, url, params=None, repo=None):
+        return self.get(url, params=params, repo=repo).json()
+
+    def graphql(self, query, variables=None, repo=None):
+        """POST a GraphQL query and return its ``data`` payload."""
+        response = self._send(
+            'POST', GRAPHQL_URL, repo, 'graphql',
+            json={'query': query, 'variables': variables or {}},
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise GitHubGraphQLError('; '.join(e.get('message', str(e)) for e in payload['errors']))
+        return payload['data']
+
+    def iter_pages(self, url, params=None, repo=None, until=None):
+        """Yield each page of a paginated list endpoint, following ``Link: rel=next``.
+
+        The next page is requested in the background while the caller works on
+        the current one. ``until(page)`` may return True to mark the current page
+        as the last one needed, in which case no further page is requested.
+        Non-200 responses raise ``requests.HTTPError``.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', MAX_PER_PAGE)
+
+        # Pages are fetched in the caller's context, so context variables (the run profile's stage) carry over
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(context.run, self.get, url, params=params, repo=repo)
+            while pending is not None:
+                response = pending.result()
+                response.raise_for_status()
+                page = response.json()
+
+                next_url = response.links.get('next', {}).get('url')
+                if not page or (until and until(page)):
+                    next_url = None
+                # The next URL already carries the query string, so params are not resent
+                pending = prefetcher.submit(context.run, self.get, next_url, repo=repo) if next_url else None
+
+                yield page
+
+    def repo_stats(self, repo):
+        with self._lock:
+            return dict(self.stats.get(repo, {'calls': 0, 'bytes': 0}))
+
+    def print_stats(self):
+        """Print calls and bytes per repository."""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda kv: kv[1]['calls'], reverse=True)
+        print("\n🌐 GitHub API usage per repo:")
+        for repo, st in items:
+            print(f"  - {repo}: {st['calls']} calls, {st['bytes'] / 1024:.1f} KB")
@@ -0,0 +1,165 @@
+import math
+from datetime import datetime
+
+# Items requested per GraphQL page, and nested connection sizes per item
+PAGE_SIZE = 50
+COMMENTS_PER_ITEM = 30
+REVIEWS_PER_PR = 50
+
+AUTHOR_FIELDS = '''
+    login
+    avatarUrl
+    __typename
+'''
+
+PULL_REQUESTS_QUERY = '''
+query($owner: String!, $repo: String!, $states: [PullRequestState!], $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    pullRequests(first: %(page)d, after: $cursor, states: $states,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        url
+        state
+        createdAt
+        updatedAt
+        closedAt
+        mergedAt
+        author { %(author)s }
+        comments(first: %(comments)d) {
+          totalCount
+          nodes { createdAt author { login __typename } }
+        }
+        reviews(first: %(reviews)d) {
+          totalCount
+          nodes { state body author { login __typename } }
+        }
+      }
+    }
+  }
+}
+''' % {'page': PAGE_SIZE, 'comments': COMMENTS_PER_ITEM, 'reviews': REVIEWS_PER_PR, 'author': AUTHOR_FIELDS}
+
+ISSUES_QUERY = '''
+query($owner: String!, $repo: String!, $states: [IssueState!], $since: DateTime, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: %(page)d, after: $cursor, states: $states, filterBy: {since: $since},
+           orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        url
+        state
+        createdAt
+        updatedAt
+        closedAt
+        author { %(author)s }
+        comments(first: %(comments)d) {
+          totalCount
+          nodes { createdAt author { login __typename } }
+        }
+      }
+    }
+  }
+}
+''' % {'page': PAGE_SIZE, 'comments': COMMENTS_PER_ITEM, 'author': AUTHOR_FIELDS}
+
+
+def parse_ts(value):
+    return datetime.fromisoformat(value[:-1]) if value else None
+
+
+def author_login(author):
+    """Return the REST-style login; deleted users become `ghost`, bots get the `[bot]` suffix."""
+    if not author:
+        return 'ghost'
+    if author.get('__typename') == 'Bot':
+        return f"{author['login']}[bot]"
+    return author['login']
+
+
+def first_response_hours(created_at, creator, comments):
+    """Hours from creation to the first comment by someone other than the creator."""
+    for c in comments:
+        if author_login(c.get('author')) != creator:
+            return math.ceil((parse_ts(c['createdAt']) - parse_ts(created_at)).total_seconds() / 3600)
+    return None
+
+
+def count_human_reviews(reviews):
+    """Same rules as get_pr_review_count: substantive reviews by non-bot users."""
+    count = 0
+    for r in reviews:
+        state = r.get('state')
+        if not (state in ('APPROVED', 'CHANGES_REQUESTED') or
+                (state == 'COMMENTED' and (r.get('body') or '').strip() != '')):
+            continue
+        if author_login(r.get('author')).endswith('[bot]'):
+            continue
+        count += 1
+    return count
+
+
+def to_rest_item(node):
+    """Map a GraphQL PullRequest/Issue node onto the REST fields used by the reports."""
+    login = author_login(node.get('author'))
+    avatar = (node.get('author') or {}).get('avatarUrl', '')
+    item = {
+        'number': node['number'],
+        'title': node['title'],
+        'body': node.get('body'),
+        'html_url': node['url'],
+        'state': node['state'].lower() if node['state'] != 'MERGED' else 'closed',
+        'user': {'login': login, 'avatar_url': avatar},
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'closed_at': node.get('closedAt'),
+        'comments': node['comments']['totalCount'],
+        'time_to_first_response': first_response_hours(node['createdAt'], login, node['comments']['nodes']),
+    }
+    if 'reviews' in node:
+        item['merged_at'] = node.get('mergedAt')
+        item['comment_count'] = node['comments']['totalCount']
+        item['review_count'] = count_human_reviews(node['reviews']['nodes'])
+    return item
+
+
+def iter_connection(client, query, variables, connection, start_date, repo_key):
+    """Page through a repository connection ordered by updatedAt, stopping at the window start."""
+    cursor = None
+    while True:
+        data = client.graphql(query, dict(variables, cursor=cursor), repo=repo_key)
+        conn = data['repository'][connection]
+        nodes = conn['nodes']
+        yield [n for n in nodes if parse_ts(n['updatedAt']) >= start_date]
+
+        if not nodes or parse_ts(nodes[-1]['updatedAt']) < start_date:
+            return
+        if not conn['pageInfo']['hasNextPage']:
+            return
+        cursor = conn['pageInfo']['endCursor']
+
+
+def iter_pull_requests(client, owner, repo, state, start_date, repo_key=None):
+    """Yield pages of REST-shaped PRs (with response time and counts) updated since ``start_date``."""
+    states = {'open': ['OPEN'], 'closed': ['CLOSED', 'MERGED']}.get(state, ['OPEN', 'CLOSED', 'MERGED'])
+    variables = {'owner': owner, 'repo': repo, 'states': states}
+    for nodes in iter_connection(client, PULL_REQUESTS_QUERY, variables, 'pullRequests', start_date, repo_key):
+        yield [to_rest_item(n) for n in nodes]
+
+
+def iter_issues(client, owner, repo, state, start_date, repo_key=None):
+    """Yield pages of REST-shaped issues (with response time) updated since ``start_date``."""
+    variables = {
+        'owner': owner,
+        'repo': repo,
+        'states': {'open': ['OPEN'], 'closed': ['CLOSED']}.get(state, ['OPEN', 'CLOSED']),
+        'since': start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+    }
+    for nodes in iter_connection(client, ISSUES_QUERY, variables, 'issues', start_date, repo_key):
+        yield [to_rest_item(n) for n in nodes]
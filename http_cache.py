@@ -0,0 +1,95 @@
+import hashlib
+import json
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from disk_lru import DiskLRU
+
+# Response headers kept alongside the cached body (Link is needed for pagination)
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class HTTPCache:
+    """On-disk cache of GitHub REST responses revalidated with conditional requests.
+
+    Each URL is stored as one JSON file holding the body and its ETag /
+    Last-Modified validators. Requests for a cached URL are sent with
+    If-None-Match / If-Modified-Since; a 304 answer (which GitHub does not
+    count against the rate limit) is served from disk. Least recently used
+    entries are evicted once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self._files = DiskLRU(directory, max_bytes)
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'stored': 0, 'evicted': 0}
+
+    def _path(self, url):
+        return self._files.path(hashlib.sha256(url.encode()).hexdigest())
+
+    def lookup(self, url):
+        """Return the cached entry for ``url`` (or None) and count the hit or miss."""
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        with self._lock:
+            self.stats['hits' if entry else 'misses'] += 1
+        return entry
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url, entry):
+        """Build a 200 response from a cached entry after the server answered 304."""
+        self._files.touch(self._path(url))
+        with self._lock:
+            self.stats['not_modified'] += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = entry['body'].encode('utf-8')
+        return response
+
+    def store(self, url, response):
+        """Persist a 200 response that carries an ETag or Last-Modified validator."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            'body': response.text,
+            'stored_at': time.time(),
+        }
+        evicted = self._files.write(self._path(url), entry)
+        with self._lock:
+            self.stats['stored'] += 1
+            self.stats['evicted'] += evicted
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+        total = self._files.total
+        print(f"\n💾 HTTP cache: {st['hits']} hits ({st['not_modified']} not modified), "
+              f"{st['misses']} misses, {st['stored']} stored, {st['evicted']} evicted, "
+              f"{total / (1024 * 1024):.1f} MB on disk")
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import threading
+import time
+
+from disk_lru import DiskLRU
+
+
+class LLMCache:
+    """Content-addressed on-disk cache of LLM completions.
+
+    A response is stored under the SHA-256 of (model, prompt, parameters,
+    prompt version), so a rerun over unchanged input is answered from disk
+    without calling the model. Bump the prompt version of a call site after
+    editing its prompt template. With ``bypass`` set, every call goes to the
+    model and the fresh response replaces the cached one. Least recently used
+    entries are evicted once the cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024, bypass=False):
+        self.directory = directory
+        self.bypass = bypass
+        self._files = DiskLRU(directory, max_bytes)
+
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+    @staticmethod
+    def key(model, prompt, params, version):
+        material = json.dumps([model, prompt, params, version], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        """Return the cached text for ``key`` (or None) and count the hit or miss."""
+        path = self._files.path(key)
+        text = None
+        if not self.bypass:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = json.load(f)['text']
+            except (OSError, ValueError, KeyError):
+                text = None
+        if text is not None:
+            self._files.touch(path)
+        with self._lock:
+            self.stats['hits' if text is not None else 'misses'] += 1
+        return text
+
+    def store(self, key, model, text):
+        evicted = self._files.write(self._files.path(key),
+                                    {'model': model, 'text': text, 'stored_at': time.time()})
+        with self._lock:
+            self.stats['stored'] += 1
+            self.stats['evicted'] += evicted
+
+    def complete(self, model, prompt, params, version, call):
+        """Return the cached completion text, or ``call()`` it and cache the result.
+
+        ``call`` must return the completion text; exceptions propagate and
+        nothing is cached for them.
+        """
+        key = self.key(model, prompt, params, version)
+        text = self.lookup(key)
+        if text is None:
+            text = call()
+            self.store(key, model, text)
+        return text
+
+    async def acomplete(self, model, prompt, params, version, call):
+        """Coroutine variant of :meth:`complete`; ``call()`` returns an awaitable."""
+        key = self.key(model, prompt, params, version)
+        text = self.lookup(key)
+        if text is None:
+            text = await call()
+            self.store(key, model, text)
+        return text
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+        total = self._files.total
+        lookups = st['hits'] + st['misses']
+        hit_rate = st['hits'] / lookups * 100 if lookups else 0.0
+        print(f"\n🧠 LLM cache: {st['hits']} hits, {st['misses']} misses ({hit_rate:.0f}% hit rate), "
+              f"{st['stored']} stored, {st['evicted']} evicted, {total / (1024 * 1024):.1f} MB on disk")
@@ -0,0 +1,79 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+
+class LLMDispatcher:
+    """Runs every LLM call of a run on one shared event loop.
+
+    The loop lives on a background thread, so repo workers (plain threads)
+    can hand it coroutines and keep fetching or rendering while the calls are
+    in flight. Model requests are wrapped in :meth:`call`, whose semaphore caps
+    how many run at once, so a summary can fan out into several requests
+    without exceeding the limit. Total time spent waiting on the model then
+    tracks the slowest calls, not their sum.
+    """
+
+    def __init__(self, concurrency=8):
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='llm-dispatch', daemon=True)
+        self._thread.start()
+        self._semaphore = asyncio.run_coroutine_threadsafe(self._make_semaphore(), self.loop).result()
+
+        self._lock = threading.Lock()
+        self._first_start = None
+        self._last_end = None
+        self.stats = {'calls': 0, 'call_seconds': 0.0, 'slowest_call': 0.0}
+
+    async def _make_semaphore(self):
+        return asyncio.Semaphore(self.concurrency)
+
+    async def call(self, coro_fn, *args, **kwargs):
+        """Await one model request under the concurrency limit. Runs on the shared loop."""
+        async with self._semaphore:
+            started = time.perf_counter()
+            with self._lock:
+                if self._first_start is None:
+                    self._first_start = started
+            try:
+                return await coro_fn(*args, **kwargs)
+            finally:
+                ended = time.perf_counter()
+                with self._lock:
+                    self._last_end = max(self._last_end or ended, ended)
+                    self.stats['calls'] += 1
+                    self.stats['call_seconds'] += ended - started
+                    self.stats['slowest_call'] = max(self.stats['slowest_call'], ended - started)
+
+    def submit(self, coro_fn, *args, **kwargs):
+        """Schedule ``coro_fn(*args, **kwargs)`` on the shared loop; returns a concurrent Future.
+
+        The coroutine sees the caller's context variables (e.g. the run
+        profile's current stage), as if it had been called in place.
+        """
+        context = contextvars.copy_context()
+
+        async def in_caller_context():
+            for var, value in context.items():
+                var.set(value)
+            return await coro_fn(*args, **kwargs)
+
+        return asyncio.run_coroutine_threadsafe(in_caller_context(), self.loop)
+
+    def run(self, coro_fn, *args, **kwargs):
+        """Run a coroutine function on the shared loop and wait for its result."""
+        return self.submit(coro_fn, *args, **kwargs).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+            wall = (self._last_end - self._first_start) if self._first_start and self._last_end else 0.0
+        print(f"\n🤖 LLM: {st['calls']} calls, {st['call_seconds']:.1f}s of model time in "
+              f"{wall:.1f}s wall (slowest call {st['slowest_call']:.1f}s)")
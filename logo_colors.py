@@ -0,0 +1,77 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from file_lock import atomic_write
+
+# Logos are averaged on a thumbnail of at most this many pixels per side
+THUMBNAIL_SIZE = (64, 64)
+
+
+def average_color(content):
+    """Average RGB color of an image as '#rrggbb', computed on a downscaled copy."""
+    img = Image.open(io.BytesIO(content)).convert('RGB')
+    img.thumbnail(THUMBNAIL_SIZE)
+    avg = np.asarray(img, dtype=np.uint8).reshape(-1, 3).mean(axis=0)
+    return "#{:02x}{:02x}{:02x}".format(*(int(c) for c in avg))
+
+
+class LogoColorCache:
+    """Persistent cache of logo glow colors.
+
+    Colors are stored by the SHA-256 of the image content, and each URL
+    remembers which content hash it served and when. Within ``ttl`` seconds a
+    URL is answered from disk without any request; after that the image is
+    downloaded again, but the color is only recomputed if its content changed.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'downloads': 0, 'computed': 0}
+        self._data = {'urls': {}, 'colors': {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable logo color cache {path}: {e}")
+
+    def _save(self):
+        atomic_write(self.path, json.dumps(self._data))
+
+    def color_for(self, url, download, offline=False):
+        """Return the glow color for ``url``; ``download()`` must return the image bytes.
+
+        With ``offline``, a cached color is served however old it is, and
+        ``download`` is only called when there is none.
+        """
+        with self._lock:
+            entry = self._data['urls'].get(url)
+            if (entry and (offline or time.time() - entry['fetched_at'] < self.ttl)
+                    and entry['sha256'] in self._data['colors']):
+                self.stats['hits'] += 1
+                return self._data['colors'][entry['sha256']]
+
+        content = download()
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            self.stats['downloads'] += 1
+            color = self._data['colors'].get(digest)
+        if color is None:
+            color = average_color(content)
+            with self._lock:
+                self.stats['computed'] += 1
+
+        with self._lock:
+            self._data['colors'][digest] = color
+            self._data['urls'][url] = {'sha256': digest, 'fetched_at': time.time()}
+            self._save()
+        return color
@@ -0,0 +1,99 @@
+import re
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+def parse_timestamps(values):
+    """Parse GitHub ISO timestamps ('...Z') into a datetime64[s] array; missing values become NaT."""
+    return np.array([v[:-1] if v else 'NaT' for v in values], dtype='datetime64[s]')
+
+
+def elapsed_seconds(start, end):
+    return (end - start) / np.timedelta64(1, 's')
+
+
+def ceil_hours(seconds):
+    return np.ceil(seconds / SECONDS_PER_HOUR).astype(np.int64)
+
+
+def referenced_issues(body):
+    if body is None:
+        return []
+    return [int(n) for n in re.findall(r'#(\d+)', body)]
+
+
+def pr_lifetimes(closed_prs, pr_created, pr_closed, issue_created_by_number):
+    """Time from the earliest referenced issue (or the PR itself) to PR closure, in hours.
+
+    Matches the old calculate_issue_to_pr_time: PRs without references use their
+    own creation time; PRs whose references match no closed issue get 0.
+    """
+    lifetimes = ceil_hours(elapsed_seconds(pr_created, pr_closed)) if len(closed_prs) else np.zeros(0, np.int64)
+    for idx, pr in enumerate(closed_prs):
+        refs = referenced_issues(pr.get('body'))
+        if not refs:
+            continue
+        created = [issue_created_by_number[n] for n in refs if n in issue_created_by_number]
+        if not created:
+            lifetimes[idx] = 0
+            continue
+        lifetimes[idx] = ceil_hours(elapsed_seconds(np.array(created, dtype='datetime64[s]'), pr_closed[idx])).min()
+    return lifetimes
+
+
+def compute_metrics(open_prs, closed_prs, open_issues, closed_issues, now):
+    """Compute every timing statistic of a repo window in one vectorized pass.
+
+    Timestamps are parsed once into NumPy arrays. Per-item results are
+    returned as integer arrays aligned with the input lists, alongside the
+    window averages. Per-day activity comes from the daily rollups.
+    """
+    now = np.datetime64(now.replace(microsecond=0), 's')
+
+    open_pr_created = parse_timestamps([pr['created_at'] for pr in open_prs])
+    closed_pr_created = parse_timestamps([pr['created_at'] for pr in closed_prs])
+    closed_pr_closed = parse_timestamps([pr['closed_at'] for pr in closed_prs])
+    open_issue_created = parse_timestamps([i['created_at'] for i in open_issues])
+    closed_issue_created = parse_timestamps([i['created_at'] for i in closed_issues])
+    closed_issue_closed = parse_timestamps([i['closed_at'] for i in closed_issues])
+
+    open_pr_age = elapsed_seconds(open_pr_created, now)
+    open_issue_age = elapsed_seconds(open_issue_created, now)
+
+    issue_created_by_number = {
+        i['number']: closed_issue_created[idx] for idx, i in enumerate(closed_issues) if i.get('created_at')
+    }
+    lifetimes = pr_lifetimes(closed_prs, closed_pr_created, closed_pr_closed, issue_created_by_number)
+    responses = np.array([pr.get('time_to_first_response') or 0 for pr in closed_prs], dtype=np.float64)
+
+    open_authors = [pr['user']['login'] for pr in open_prs]
+    closed_authors = [pr['user']['login'] for pr in closed_prs]
+
+    return {
+        'open_prs': {
+            'hours_open': ceil_hours(open_pr_age),
+            'days_open': np.floor_divide(open_pr_age, SECONDS_PER_DAY).astype(np.int64),
+        },
+        'open_issues': {
+            'hours_open': ceil_hours(open_issue_age),
+            'days_open': np.floor_divide(open_issue_age, SECONDS_PER_DAY).astype(np.int64),
+        },
+        'closed_prs': {
+            'lifetime_hours': lifetimes,
+        },
+        'closed_issues': {
+            'duration_hours': ceil_hours(elapsed_seconds(closed_issue_created, closed_issue_closed)),
+        },
+        'summary': {
+            'open_prs': len(open_prs),
+            'closed_prs': len(closed_prs),
+            'open_issues': len(open_issues),
+            'closed_issues': len(closed_issues),
+            'contributors': len(set(open_authors) | set(closed_authors)),
+            'avg_response_hours': round(float(responses.mean()), 1) if len(closed_prs) else None,
+            'avg_lifetime_hours': round(float(lifetimes.mean()), 1) if len(closed_prs) else None,
+        },
+    }
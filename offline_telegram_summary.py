@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 import pytz
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
@@ -8,6 +7,8 @@ from anthropic import Anthropic
 from dotenv import load_dotenv
 import argparse
 import re
+from llm_cache import LLMCache
+import report_io
 
 # Configure logging and load environment variables
 load_dotenv()
@@ -18,25 +19,31 @@ if not ANTHROPIC_API_KEY:
     print("Error: ANTHROPIC_API_KEY environment variable is not set.")
     sys.exit(1)
 
+# Summaries are cached by hash of model, prompt, parameters and prompt version
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".cache/llm")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "50"))
+# Bump after editing the summary prompt so cached summaries are not reused
+PROMPT_VERSION = 1
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Generate HTML summary from Telegram JSON data.')
     parser.add_argument('json_file', help='Path to the JSON file containing Telegram chat data')
     parser.add_argument('--output', default='offline_test.html', 
                         help='Output HTML file path (default: offline_test.html)')
+    parser.add_argument('--no-llm-cache', action='store_true',
+                        help='Query the model even when a cached summary exists (the fresh one is still cached)')
     return parser.parse_args()
 
 def load_telegram_data(json_file_path):
-    """Load Telegram data from a JSON file."""
+    """Load Telegram data from an export in any format written by report_io (JSON, compressed JSON, msgpack)."""
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        return data
+        return report_io.load(json_file_path)
     except FileNotFoundError:
         print(f"Error: File {json_file_path} not found.")
         sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"Error: Failed to parse JSON data from {json_file_path}.")
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: Failed to parse data from {json_file_path}: {e}")
         sys.exit(1)
 
 def process_telegram_data(data):
@@ -151,7 +158,7 @@ def process_telegram_data(data):
         'participant_days': participant_days
     }
 
-def generate_summary(processed_data, anthropic_key):
+def generate_summary(processed_data, anthropic_key, llm_cache):
     """Generate a summary of the Telegram chat using Claude 3.7."""
     messages = processed_data['messages']
     chat_title = processed_data['chat_title']
@@ -248,20 +255,18 @@ Remember, your goal is to provide a concise yet technically accurate summary tha
 Your final output should consist only of the summary with the structure outlined above and should not duplicate or rehash any of the analysis work you did in the <detailed_analysis> section.
 """
     
-    print("Sending chat to Claude 3.7 for summarization...")
-    try:
+    model = "claude-3-5-sonnet-20240620"  # Using Claude 3.5 Sonnet
+    params = dict(max_tokens=4000, temperature=0.3)
+    prompt = {'system': system_prompt, 'messages': [{"role": "user", "content": user_prompt}]}
+
+    def request_summary():
+        print("Sending chat to Claude 3.7 for summarization...")
         anthropic_client = Anthropic(api_key=anthropic_key)
-        response = anthropic_client.messages.create(
-            model="claude-3-5-sonnet-20240620",  # Using Claude 3.5 Sonnet
-            max_tokens=4000,
-            temperature=0.3,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-        
-        summary = response.content[0].text
+        response = anthropic_client.messages.create(model=model, **prompt, **params)
+        return response.content[0].text
+
+    try:
+        summary = llm_cache.complete(model, prompt, params, PROMPT_VERSION, request_summary)
         print("Summary received from Claude")
         
         # Process the summary to extract sections using regex
@@ -1008,7 +1013,9 @@ def main():
     processed_data = process_telegram_data(telegram_data)
     
     print("Generating summary...")
-    summary_data = generate_summary(processed_data, ANTHROPIC_API_KEY)
+    llm_cache = LLMCache(LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024, bypass=args.no_llm_cache)
+    summary_data = generate_summary(processed_data, ANTHROPIC_API_KEY, llm_cache)
+    llm_cache.print_stats()
     
     print("Generating HTML report...")
     generate_html(processed_data, summary_data, args.output)
@@ -0,0 +1,142 @@
+import threading
+import time
+
+# Status codes GitHub uses for primary and secondary rate limits
+RATE_LIMIT_STATUSES = (403, 429)
+# Transient server errors worth retrying with a short backoff
+RETRY_STATUSES = (502, 503, 504)
+
+
+class RateLimitScheduler:
+    """Central pacing for GitHub requests based on the rate limit headers.
+
+    Tracks ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` per resource
+    (``core``, ``graphql``, ...). While plenty of budget is left requests go
+    out immediately; below ``low_water`` of the limit they are spread evenly
+    over the time left until the reset, and below ``reserve`` they wait for
+    the reset. Rate limited responses are retried after ``Retry-After``, the
+    reset time or an exponential backoff instead of being dropped.
+    """
+
+    def __init__(self, low_water=0.2, reserve=10, max_retries=6, base_backoff=60, clock=time.time, sleep=time.sleep):
+        self.low_water = low_water
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        # resource -> {'limit', 'remaining', 'reset', 'next_slot'}
+        self.buckets = {}
+        self.stats = {'waited_seconds': 0.0, 'retries': 0, 'rate_limited': 0}
+
+    def _wait(self, seconds):
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.stats['waited_seconds'] += seconds
+        self._sleep(seconds)
+
+    def remaining(self, resource='core'):
+        """Requests left for ``resource`` in the current window, or None if unknown."""
+        with self._lock:
+            bucket = self.buckets.get(resource)
+            if bucket is None or self._clock() >= bucket['reset']:
+                return None
+            return bucket['remaining']
+
+    def acquire(self, resource='core'):
+        """Block until a request against ``resource`` fits the remaining budget."""
+        with self._lock:
+            bucket = self.buckets.get(resource)
+            if bucket is None:
+                return
+            now = self._clock()
+            if now >= bucket['reset']:
+                # The window rolled over; the next response refreshes the numbers
+                del self.buckets[resource]
+                return
+
+            if bucket['remaining'] <= self.reserve:
+                delay = bucket['reset'] - now + 1
+            elif bucket['remaining'] <= bucket['limit'] * self.low_water:
+                interval = (bucket['reset'] - now) / (bucket['remaining'] - self.reserve)
+                slot = max(now, bucket['next_slot'])
+                bucket['next_slot'] = slot + interval
+                delay = slot - now
+            else:
+                delay = 0
+            # Count the request now so concurrent workers see the reduced budget
+            bucket['remaining'] -= 1
+
+        if delay > 0:
+            print(f"⏳ Pacing GitHub '{resource}' requests: waiting {delay:.1f}s "
+                  f"({bucket['remaining']} left until reset)")
+            self._wait(delay)
+
+    def update(self, response):
+        """Record the budget reported by a response; returns its resource name."""
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        if 'X-RateLimit-Remaining' not in headers:
+            return resource
+        try:
+            limit = int(headers.get('X-RateLimit-Limit', 0))
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset = int(headers.get('X-RateLimit-Reset', 0))
+        except ValueError:
+            return resource
+        with self._lock:
+            bucket = self.buckets.setdefault(resource, {'next_slot': 0})
+            bucket.update(limit=limit, remaining=remaining, reset=reset)
+        return resource
+
+    def retry_delay(self, response, attempt):
+        """Seconds to wait before retrying ``response``, or None if it should not be retried."""
+        if attempt >= self.max_retries:
+            return None
+
+        status = response.status_code
+        if status in RETRY_STATUSES:
+            return min(2 ** attempt, 30)
+        if status not in RATE_LIMIT_STATUSES:
+            return None
+
+        headers = response.headers
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(int(retry_after), 1)
+            except ValueError:
+                pass
+        if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+            return max(int(headers['X-RateLimit-Reset']) - self._clock() + 1, 1)
+        if status == 403 and 'rate limit' not in response.text.lower():
+            # A plain permission error, not a rate limit
+            return None
+        # Secondary rate limit without guidance: back off exponentially
+        return self.base_backoff * (2 ** attempt)
+
+    def backoff(self, response, attempt):
+        """Wait before retrying ``response``. Returns False if it should not be retried."""
+        delay = self.retry_delay(response, attempt)
+        if delay is None:
+            return False
+        with self._lock:
+            self.stats['retries'] += 1
+            if response.status_code in RATE_LIMIT_STATUSES:
+                self.stats['rate_limited'] += 1
+        print(f"⚠️  GitHub returned {response.status_code} for {response.url}; "
+              f"retrying in {delay:.0f}s (attempt {attempt + 1}/{self.max_retries})")
+        self._wait(delay)
+        return True
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+            buckets = {k: dict(v) for k, v in self.buckets.items()}
+        print(f"\n🚦 Rate limit: {st['rate_limited']} rate-limited responses, {st['retries']} retries, "
+              f"{st['waited_seconds']:.0f}s spent waiting")
+        for resource, b in sorted(buckets.items()):
+            print(f"  - {resource}: {b['remaining']}/{b['limit']} remaining")
@@ -0,0 +1,116 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class User:
+    """The two author fields the reports use."""
+
+    __slots__ = ('login', 'avatar_url')
+
+    def __init__(self, login, avatar_url=''):
+        self.login = login
+        self.avatar_url = avatar_url
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {'login': self.login, 'avatar_url': self.avatar_url}
+
+
+class Record:
+    """Compact PR/issue record holding only the fields the pipeline reads.
+
+    Replaces the full GitHub REST payload (head/base/repo/_links, ...). Dict
+    style access (``pr['title']``, ``pr.get('body')``, ``'x' in pr``) is kept so
+    enrichment and rendering code work unchanged. Fields that were never set
+    behave like missing keys.
+    """
+
+    # Fields copied from the GitHub payload
+    SOURCE_FIELDS = (
+        'number', 'title', 'body', 'html_url', 'state',
+        'created_at', 'updated_at', 'closed_at', 'merged_at', 'comments',
+    )
+    # Fields added by enrichment and the metrics stage
+    DERIVED_FIELDS = (
+        'time_to_first_response', 'comment_count', 'review_count',
+        'days_open', 'hours_open', 'lifetime_hours', 'duration_hours',
+    )
+
+    __slots__ = SOURCE_FIELDS + DERIVED_FIELDS + ('user',)
+
+    @classmethod
+    def from_payload(cls, payload):
+        record = cls()
+        for field in cls.SOURCE_FIELDS + cls.DERIVED_FIELDS:
+            if field in payload:
+                setattr(record, field, payload[field])
+        user = payload.get('user') or {}
+        record.user = User(user.get('login', 'ghost'), user.get('avatar_url', ''))
+        return record
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        data = {}
+        for field in self.__slots__:
+            if hasattr(self, field):
+                value = getattr(self, field)
+                data[field] = value.to_dict() if isinstance(value, User) else value
+        return data
+
+
+def to_json(obj):
+    """``json.dump`` default hook for records."""
+    if isinstance(obj, (Record, User)):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class RawPayloadArchive:
+    """Optional gzip JSON-lines archive of the untouched GitHub payloads.
+
+    Off by default; enable it to keep the full REST responses for debugging
+    while the pipeline itself only carries compact records.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    def write(self, repo_key, endpoint, payloads):
+        if not payloads:
+            return
+        folder = os.path.join(self.directory, repo_key.replace('/', '__'))
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'{endpoint}_{self._stamp}.jsonl.gz')
+        with self._lock, gzip.open(path, 'at') as f:
+            for payload in payloads:
+                f.write(json.dumps(payload) + '\n')
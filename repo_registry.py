@@ -0,0 +1,140 @@
+import ast
+import hashlib
+import json
+import os
+
+# Options a registry entry (or the registry's "defaults") may set
+REPO_OPTIONS = {
+    'enabled': True,
+    'fetch_mode': None,   # None: use --fetch-mode / GITHUB_FETCH_MODE
+}
+
+
+class RegistryError(ValueError):
+    """Raised for a malformed repository registry."""
+
+
+class RepoEntry:
+    """One ``owner/repo`` of the registry with its per-repo options."""
+
+    __slots__ = ('owner', 'repo') + tuple(REPO_OPTIONS)
+
+    def __init__(self, owner, repo, **options):
+        unknown = set(options) - set(REPO_OPTIONS)
+        if unknown:
+            raise RegistryError(f"Unknown option(s) for {owner}/{repo}: {', '.join(sorted(unknown))}")
+        self.owner = owner
+        self.repo = repo
+        for name, default in REPO_OPTIONS.items():
+            setattr(self, name, options.get(name, default))
+        if self.fetch_mode not in (None, 'rest', 'graphql'):
+            raise RegistryError(f"{owner}/{repo}: fetch_mode must be 'rest' or 'graphql'")
+
+    @property
+    def full_name(self):
+        return f'{self.owner}/{self.repo}'
+
+    def __repr__(self):
+        return f'RepoEntry({self.full_name!r})'
+
+
+def _split_name(name):
+    owner, sep, repo = name.strip().partition('/')
+    if not sep or not owner or not repo or '/' in repo:
+        raise RegistryError(f"Expected 'owner/repo', got {name!r}")
+    return owner, repo
+
+
+def _check_unique(entries):
+    """Reject entries sharing a repository name.
+
+    Report folders, catalog entries and pages are keyed by the bare repo
+    name, so ``a/foo`` and ``b/foo`` would overwrite each other's output.
+    """
+    seen = {}
+    for entry in entries:
+        other = seen.setdefault(entry.repo.lower(), entry)
+        if other is not entry:
+            if other.full_name.lower() == entry.full_name.lower():
+                raise RegistryError(f"{entry.full_name} is listed twice")
+            raise RegistryError(f"{other.full_name} and {entry.full_name} share the repository name "
+                                f"{entry.repo!r}; reports are stored per repository name")
+    return entries
+
+
+def parse_registry(config):
+    """Build entries from a registry document.
+
+    The document holds ``repos``, a list of ``"owner/repo"`` strings or
+    ``{"repo": "owner/repo", <option>: ...}`` objects, and optional
+    ``defaults`` applied to every entry. Disabled entries are dropped.
+    Repository names must be unique, even across owners.
+    """
+    if not isinstance(config, dict) or not isinstance(config.get('repos'), list):
+        raise RegistryError("The registry must be an object with a 'repos' list")
+    defaults = config.get('defaults', {})
+    entries = []
+    for item in config['repos']:
+        options = dict(defaults)
+        if isinstance(item, str):
+            name = item
+        elif isinstance(item, dict) and 'repo' in item:
+            options.update(item)
+            name = options.pop('repo')
+        else:
+            raise RegistryError(f"Invalid registry entry: {item!r}")
+        entries.append(RepoEntry(*_split_name(name), **options))
+    # Disabled entries count too: enabling one later must not collide
+    return [entry for entry in _check_unique(entries) if entry.enabled]
+
+
+def parse_legacy_repos(value):
+    """Entries from the old ``REPOS`` setting.
+
+    Accepts the Python list literal of ``(repo, owner)`` tuples used so far
+    and the comma separated ``owner/repo`` form.
+    """
+    value = value.strip()
+    if value.startswith('['):
+        return _check_unique([RepoEntry(owner, repo) for repo, owner in ast.literal_eval(value)])
+    return _check_unique([RepoEntry(*_split_name(name)) for name in value.split(',') if name.strip()])
+
+
+def load_registry(path, legacy_repos=None):
+    """Load the registry file at ``path``; fall back to the ``REPOS`` value when it does not exist."""
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            try:
+                config = json.load(f)
+            except ValueError as e:
+                raise RegistryError(f"Cannot parse {path}: {e}")
+        return parse_registry(config)
+    if legacy_repos:
+        return parse_legacy_repos(legacy_repos)
+    raise RegistryError(f"No repository registry at {path} and REPOS is not set")
+
+
+def parse_shard(value):
+    """``'i/N'`` (1-based) -> ``(i - 1, N)``."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise RegistryError(f"Shard must look like i/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise RegistryError(f"Shard {value} out of range (expected 1 <= i <= N)")
+    return index - 1, count
+
+
+def shard_of(entry, count):
+    """Shard (0-based) that owns ``entry``.
+
+    Based on a hash of the repository name rather than its position, so
+    adding or removing registry entries does not move the other repositories
+    to different shards.
+    """
+    digest = hashlib.sha1(entry.full_name.lower().encode()).hexdigest()
+    return int(digest, 16) % count
+
+
+def select_shard(entries, index, count):
+    return [entry for entry in entries if shard_of(entry, count) == index]
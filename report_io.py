@@ -0,0 +1,94 @@
+import gzip
+import json
+import os
+
+from file_lock import atomic_write
+
+# Format name -> file extension appended to the file stem
+FORMATS = {
+    'json': '.json',             # compact JSON
+    'json-indent': '.json',      # indented JSON (the historical layout)
+    'json.gz': '.json.gz',
+    'json.zst': '.json.zst',
+    'msgpack': '.msgpack',
+}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("The json.zst format needs the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError("The msgpack format needs the 'msgpack' package (pip install msgpack)")
+    return msgpack
+
+
+def encode(obj, fmt='json', default=None):
+    """Serialize ``obj`` to bytes in ``fmt``; ``default`` converts unsupported objects (as for json.dump)."""
+    if fmt == 'msgpack':
+        return _msgpack().packb(obj, default=default, use_bin_type=True)
+    if fmt == 'json-indent':
+        text = json.dumps(obj, indent=4, ensure_ascii=False, default=default)
+    else:
+        text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default)
+    raw = text.encode('utf-8')
+    if fmt == 'json.gz':
+        return gzip.compress(raw, compresslevel=6)
+    if fmt == 'json.zst':
+        return _zstd().ZstdCompressor(level=10).compress(raw)
+    if fmt in ('json', 'json-indent'):
+        return raw
+    raise ValueError(f"Unknown report format '{fmt}' (expected one of: {', '.join(FORMATS)})")
+
+
+def decode(blob):
+    """Deserialize bytes written by :func:`encode`, detecting the format from the content."""
+    if blob.startswith(GZIP_MAGIC):
+        return json.loads(gzip.decompress(blob))
+    if blob.startswith(ZSTD_MAGIC):
+        return json.loads(_zstd().ZstdDecompressor().decompressobj().decompress(blob))
+    stripped = blob.lstrip()
+    if stripped[:1] in (b'{', b'['):
+        return json.loads(blob)
+    return _msgpack().unpackb(blob, raw=False, strict_map_key=False)
+
+
+def dump(obj, stem, fmt='json', default=None):
+    """Write ``obj`` to ``stem`` + the format's extension and return the path written.
+
+    Copies of the same stem in other formats are removed so readers never
+    pick up a stale file.
+    """
+    path = stem + FORMATS[fmt] if fmt in FORMATS else stem
+    blob = encode(obj, fmt, default)
+    atomic_write(path, blob)
+    for ext in set(FORMATS.values()):
+        if stem + ext != path and os.path.exists(stem + ext):
+            os.remove(stem + ext)
+    return path
+
+
+def find(stem):
+    """Path of the file written for ``stem`` in any format, or None."""
+    for ext in FORMATS.values():
+        if os.path.exists(stem + ext):
+            return stem + ext
+    return None
+
+
+def load(path):
+    """Read a report file in any supported format; ``path`` may also be a stem."""
+    if not os.path.exists(path):
+        path = find(path) or path
+    with open(path, 'rb') as f:
+        return decode(f.read())
@@ -0,0 +1,142 @@
+import contextlib
+import contextvars
+import json
+import threading
+import time
+from datetime import datetime
+
+from file_lock import atomic_write
+
+# Stages of a repository run in pipeline order; 'other' is the rest of a run's time
+STAGES = ('fetch', 'enrichment', 'color', 'summary', 'render', 'other')
+# Row for the work done once per run rather than per repository (ecosystem summary, render phase)
+SITE = '(site)'
+COUNTERS = ('seconds', 'http_calls', 'http_bytes', 'llm_calls', 'prompt_tokens', 'completion_tokens')
+
+# Innermost open stage of the current thread or asyncio task: [repo, stage, (start, end) of nested stages]
+_current = contextvars.ContextVar('run_profile_stage', default=None)
+
+
+def empty_counters():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def covered_seconds(intervals):
+    """Length of the union of sorted ``(start, end)`` intervals."""
+    total = 0.0
+    cover_start = cover_end = None
+    for start, end in intervals:
+        if cover_end is None or start > cover_end:
+            if cover_end is not None:
+                total += cover_end - cover_start
+            cover_start, cover_end = start, end
+        else:
+            cover_end = max(cover_end, end)
+    if cover_end is not None:
+        total += cover_end - cover_start
+    return total
+
+
+class RunProfile:
+    """Wall time, GitHub traffic and LLM tokens per repository and stage of a run.
+
+    Work is wrapped in ``stage(repo, name)``. GitHub responses and model usage
+    are charged to the innermost stage open in the thread or asyncio task they
+    happen in; the stage is a context variable, so it follows work handed to
+    other threads or the LLM loop together with the context. Stages nest
+    exclusively: time spent in an inner stage is not counted again in the
+    outer one, so a repository run wrapped in 'other' ends up with only the
+    time outside every named stage there. Inner stages running in parallel
+    threads (backfilled weeks) overlap; the outer stage loses the time any
+    of them was running, once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        # (repo, stage) -> counters
+        self.stats = {}
+
+    def _add(self, repo, stage, **counts):
+        with self._lock:
+            counters = self.stats.setdefault((repo, stage), empty_counters())
+            for key, value in counts.items():
+                counters[key] += value
+
+    @contextlib.contextmanager
+    def stage(self, repo, name):
+        frame = [repo, name, []]
+        token = _current.set(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            _current.reset(token)
+            parent = _current.get()
+            with self._lock:
+                if parent is not None:
+                    parent[2].append((started, ended))
+                nested = sorted(frame[2])
+            self._add(repo, name, seconds=ended - started - covered_seconds(nested))
+
+    def record_http(self, repo, nbytes):
+        """Charge one GitHub response of ``nbytes`` bytes; ``repo`` is used outside any stage."""
+        frame = _current.get()
+        if frame is None:
+            self._add(repo or SITE, 'other', http_calls=1, http_bytes=nbytes)
+        else:
+            self._add(frame[0], frame[1], http_calls=1, http_bytes=nbytes)
+
+    def record_llm(self, usage):
+        """Charge one model request and its token ``usage`` (as returned by the API, may be None)."""
+        frame = _current.get() or (SITE, 'other', [])
+        self._add(frame[0], frame[1], llm_calls=1,
+                  prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+                  completion_tokens=getattr(usage, 'completion_tokens', 0) or 0)
+
+    def summary(self):
+        """The profile as plain data: per-repo stage counters and totals, slowest repository first."""
+        with self._lock:
+            stats = {key: dict(counters) for key, counters in self.stats.items()}
+
+        repos = {}
+        totals = {stage: empty_counters() for stage in STAGES}
+        for (repo, stage), counters in stats.items():
+            entry = repos.setdefault(repo, {'repo': repo, 'stages': {}, 'total': empty_counters()})
+            entry['stages'][stage] = counters
+            for key, value in counters.items():
+                entry['total'][key] += value
+                totals[stage][key] += value
+        for entry in repos.values():
+            entry['total']['seconds'] = round(entry['total']['seconds'], 3)
+            for counters in entry['stages'].values():
+                counters['seconds'] = round(counters['seconds'], 3)
+        for counters in totals.values():
+            counters['seconds'] = round(counters['seconds'], 3)
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_seconds': round(time.perf_counter() - self._started, 3),
+            'stages': list(STAGES),
+            'repos': sorted(repos.values(), key=lambda entry: entry['total']['seconds'], reverse=True),
+            'totals': totals,
+        }
+
+    def save(self, path):
+        """Write the profile as JSON to ``path``; returns the summary written."""
+        summary = self.summary()
+        atomic_write(path, json.dumps(summary, indent=2))
+        return summary
+
+    def print_stats(self, top=10):
+        summary = self.summary()
+        print(f"\n📊 Run profile ({summary['wall_seconds']:.1f}s wall), slowest repositories:")
+        for entry in summary['repos'][:top]:
+            stages = ', '.join(f"{stage} {entry['stages'][stage]['seconds']:.1f}s"
+                               for stage in STAGES if stage in entry['stages'])
+            total = entry['total']
+            print(f"  - {entry['repo']}: {total['seconds']:.1f}s ({stages}); "
+                  f"{total['http_calls']} calls, {total['http_bytes'] / 1024:.1f} KB, "
+                  f"{total['prompt_tokens'] + total['completion_tokens']} tokens")
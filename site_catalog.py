@@ -0,0 +1,139 @@
+import copy
+import json
+import os
+import threading
+
+import report_io
+from file_lock import atomic_write, locked
+
+
+class SiteCatalog:
+    """Small JSON index of every report in ``weekly_report/``.
+
+    For each repository it keeps the owner, the week folders that have a
+    rendered report (newest first) and the headline stats of the latest week.
+    It is updated whenever a week is written, so the index, organization and
+    repository pages are built from this one file instead of scanning
+    folders and loading every week's data file. A missing catalog is rebuilt
+    from the report folders once.
+
+    Updates re-read the file under a lock file, so several processes (one
+    per ``--shard``) can record weeks into the same catalog.
+    """
+
+    def __init__(self, path, report_dir='weekly_report', owners=None):
+        self.path = path
+        self.report_dir = report_dir
+        self._lock = threading.Lock()
+        self._repos = None
+        # repo -> owner hints used only when rebuilding from the report folders
+        self._owners = dict(owners or {})
+
+    def _load(self, reload=False):
+        """Load (or rebuild) the catalog. Lock held."""
+        if self._repos is not None and not reload:
+            return
+        with locked(self.path):
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._repos = json.load(f)['repos']
+                    return
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Warning: rebuilding unreadable site catalog {self.path}: {e}")
+            self._repos = self._scan()
+            self._save()
+
+    def _save(self):
+        atomic_write(self.path, json.dumps({'repos': self._repos}, separators=(',', ':')))
+
+    def _scan(self):
+        """Build catalog entries from the report folders (used once, for existing trees)."""
+        repos = {}
+        if not os.path.isdir(self.report_dir):
+            return repos
+        print(f"Building site catalog {self.path} from {self.report_dir}/ ...")
+        for project in os.listdir(self.report_dir):
+            project_dir = os.path.join(self.report_dir, project)
+            if not os.path.isdir(project_dir):
+                continue
+            weeks = sorted((w for w in os.listdir(project_dir)
+                            if os.path.exists(os.path.join(project_dir, w, 'data.html'))), reverse=True)
+            entry = {'owner': self._owners.get(project), 'weeks': weeks, 'latest': None}
+            if weeks:
+                try:
+                    data = report_io.load(os.path.join(project_dir, weeks[0], 'data'))
+                    entry['latest'] = week_stats(weeks[0], data)
+                    entry['owner'] = entry['owner'] or owner_from_data(data)
+                except (OSError, ValueError, KeyError, RuntimeError) as e:
+                    print(f"Error reading data for {project}: {e}")
+            # Last resort: use project name as owner (likely incorrect but prevents errors)
+            entry['owner'] = entry['owner'] or project
+            repos[project] = entry
+        return repos
+
+    def record_week(self, repo, owner, week, data, summary=None, page=None):
+        """Register the report of ``week`` (folder name) for ``repo`` and persist the catalog.
+
+        ``summary`` is the repo's line for the ecosystem summary, kept so a
+        later ``--site-only`` run can summarize repos processed elsewhere.
+        ``page`` is what the week's report page is rendered from besides the
+        data file (glow color, logo, data hash).
+        """
+        with self._lock:
+            self._load()
+            with locked(self.path):
+                # Pick up weeks recorded by other processes since the last read
+                if os.path.exists(self.path):
+                    with open(self.path, 'r') as f:
+                        self._repos = json.load(f)['repos']
+                entry = self._repos.setdefault(repo, {'owner': owner, 'weeks': [], 'latest': None})
+                entry['owner'] = owner
+                if week not in entry['weeks']:
+                    entry['weeks'].append(week)
+                    entry['weeks'].sort(reverse=True)
+                if page is not None:
+                    entry.setdefault('pages', {})[week] = page
+                if entry['weeks'][0] == week:
+                    entry['latest'] = week_stats(week, data)
+                    if summary is not None:
+                        entry['summary'] = summary
+                self._save()
+
+    def repos(self, reload=False):
+        """Return repo -> {'owner', 'weeks', 'latest', 'summary', 'pages'} (a snapshot).
+
+        ``reload`` re-reads the file to include weeks recorded by other processes.
+        """
+        with self._lock:
+            self._load(reload)
+            return copy.deepcopy(self._repos)
+
+    def entry(self, repo):
+        with self._lock:
+            self._load()
+            entry = self._repos.get(repo)
+            return copy.deepcopy(entry)
+
+
+def week_stats(week, data):
+    """Headline numbers of a week's data file shown on the index pages."""
+    if 'metrics' in data:
+        open_prs, open_issues = data['metrics']['open_prs'], data['metrics']['open_issues']
+    else:
+        open_prs, open_issues = len(data.get('opened_prs', [])), len(data.get('opened_issues', []))
+    return {
+        'week': week,
+        'open_prs': open_prs,
+        'open_issues': open_issues,
+        'end_date': data['end_date'][:19],
+    }
+
+
+def owner_from_data(data):
+    """Organization name taken from a PR URL (https://github.com/ORGANIZATION/REPO/pull/NUMBER)."""
+    for pr in data.get('opened_prs') or []:
+        parts = (pr.get('html_url') or '').split('/')
+        if len(parts) >= 5:
+            return parts[3]
+    return None
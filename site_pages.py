@@ -0,0 +1,308 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import report_io
+from site_renderer import SiteRenderer, VOLATILE_CONTEXT
+
+# Page contexts are built from serialized week data and catalog entries only,
+# so pages can be rendered in worker processes that never see the pipeline state.
+
+
+def nerv_id(prefix, name):
+    """Evangelion style ID; stable across runs (unlike hash()) so unchanged pages stay unchanged."""
+    return f"{prefix}-{int(hashlib.md5(name.encode()).hexdigest(), 16) % 1000:03d}"
+
+# Helper to display hours as "Xh" or days as "Xd"
+def format_hours_or_days(hours):
+    if hours is None:
+        return "N/A"
+    return f"{hours}h"  # Always display in hours
+
+def get_response_time_color(hours):
+    """
+    Color code response times:
+    - N/A or None: red
+    - Over 24 hours: red
+    - 4-24 hours: yellow
+    - Under 4 hours: green
+    """
+    if hours is None or hours == "N/A":
+        return "#FF4136"  # Red for N/A
+    if hours > 24:
+        return "#FF4136"  # Red for >24 hours
+    if hours <= 4:
+        return "#2ECC40"  # Green for ≤4 hours
+    return "#FFDC00"  # Yellow for 4-24 hours
+
+# Generate a unique retro neon color based on username
+def generate_retro_neon_color(username):
+    # Use hash of username to generate a consistent color
+    hash_obj = hashlib.md5(username.encode())
+    hash_int = int(hash_obj.hexdigest(), 16)
+
+    # Retro neon color palette - removed yellow and light colors that don't contrast well
+    retro_neon_colors = [
+        "#ff00ff",  # Magenta
+        "#00ffff",  # Cyan
+        "#ff0099",  # Hot Pink
+        "#33cc00",  # Darker Lime Green
+        "#ff3300",  # Neon Orange
+        "#9900ff",  # Purple
+        "#0066ff",  # Darker Blue
+        "#ff0066",  # Pink
+        "#cc00cc",  # Darker Magenta
+        "#0099cc",  # Darker Cyan
+        "#cc3300",  # Darker Orange
+        "#6600cc",  # Darker Purple
+    ]
+
+    # Select a color from the palette based on the hash
+    color_index = hash_int % len(retro_neon_colors)
+    return retro_neon_colors[color_index]
+
+
+# ====================== Page contexts ========================
+def report_context(data, repo_owner, repo, glow_color, logo_url):
+    """Context of a weekly report page from the week's data file."""
+    start_d = datetime.fromisoformat(data['start_date'])
+    end_d = datetime.fromisoformat(data['end_date'])
+
+    # human readable date range
+    if start_d.year == end_d.year:
+        if start_d.month == end_d.month:
+            date_range = f"{start_d.strftime('%b %d')} - {end_d.strftime('%d, %Y')}"
+        else:
+            date_range = f"{start_d.strftime('%b %d')} - {end_d.strftime('%b %d, %Y')}"
+    else:
+        date_range = f"{start_d.strftime('%b %d, %Y')} - {end_d.strftime('%b %d, %Y')}"
+
+    # Chart data
+    sorted_dates = sorted(data['aggregated_stats'].keys())
+    activity = {'labels': [], 'prs_closed': [], 'issues_closed': [], 'contributors': []}
+    for dstr in sorted_dates:
+        dt_obj = datetime.strptime(dstr,"%Y-%m-%d")
+        st = data['aggregated_stats'][dstr]
+        activity['labels'].append(dt_obj.strftime("%m/%d"))
+        activity['prs_closed'].append(st['prs_closed'])
+        activity['issues_closed'].append(st['issues_closed'])
+        activity['contributors'].append(st['contributors'])
+
+    # Summaries
+    summary_lines = []
+    if data['wartime_milady_ceo_summary']:
+        for line in data['wartime_milady_ceo_summary']:
+            # Remove markdown bullet points if they exist; any HTML in the line is kept
+            line = line.strip()
+            if line.startswith('- ') or line.startswith('* '):
+                line = line[2:]
+            summary_lines.append(line)
+        # Add "Summary:" to the first bullet point
+        summary_lines[0] = f"<strong>Summary:</strong> {summary_lines[0]}"
+
+    def table_row(item, kind, timestamp, age, extra):
+        resp_h = item.get('time_to_first_response')
+        return {
+            'date': datetime.fromisoformat(item[timestamp][:-1]).strftime("%b %d"),
+            'url': f"https://github.com/{repo_owner}/{repo}/{kind}/{item['number']}",
+            'title': item['title'],
+            'author': item['user']['login'],
+            'avatar': item['user']['avatar_url'],
+            'author_color': generate_retro_neon_color(item['user']['login']),
+            'age': format_hours_or_days(age),
+            'extra': extra,
+            'response': f"{resp_h}h" if resp_h else "N/A",
+            'response_color': get_response_time_color(resp_h),
+        }
+
+    def pr_counts(pr):
+        # Filled in before the data file is written; older files may lack them
+        return (pr.get('comment_count', "N/A"), pr.get('review_count', "N/A"))
+
+    return dict(
+        repo_owner=repo_owner,
+        repo=repo,
+        date_range=date_range,
+        glow_color=glow_color,
+        logo_url=logo_url,
+        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        open_pr_count=len(data['opened_prs']),
+        closed_pr_count=len(data['closed_prs']),
+        metrics=data['metrics'],
+        summary_lines=summary_lines,
+        activity=activity,
+        open_pr_rows=[
+            table_row(pr, 'pull', 'created_at', pr['hours_open'], pr_counts(pr))
+            for pr in data['opened_prs']
+        ],
+        closed_pr_rows=[
+            table_row(pr, 'pull', 'closed_at', pr['lifetime_hours'], pr_counts(pr))
+            for pr in data['closed_prs']
+        ],
+        open_issue_rows=[
+            table_row(iss_, 'issues', 'created_at', iss_['hours_open'], ("N/A", "N/A"))
+            for iss_ in data['opened_issues']
+        ],
+        # Ensure we're iterating over a list even if closed_issues is missing or None
+        closed_issue_rows=[
+            table_row(iss_, 'issues', 'closed_at', iss_['duration_hours'], (iss_.get("comments", "N/A"), "N/A"))
+            for iss_ in data.get('closed_issues') or [] if iss_.get('closed_at')
+        ],
+        spec_links=data['spec_links'],
+        # Older data files have no trend windows
+        trends=data.get('trends'),
+    )
+
+
+def organizations_from_catalog(catalog_repos):
+    """Group catalog entries (repo -> entry) by owner with per-organization totals."""
+    organizations = {}
+
+    for project, entry in sorted(catalog_repos.items()):
+        repo_owner = entry['owner']
+        latest = entry['latest'] or {}
+        repo_stats = {
+            'description': 'Repository analysis and status tracking',
+            'open_prs': latest.get('open_prs', 0),
+            'open_issues': latest.get('open_issues', 0),
+            # Time of the last update; pages show it as "Nh ago" in the browser
+            'last_updated': latest.get('end_date', 'N/A')
+        }
+
+        # Add repository to the organization's list
+        if repo_owner not in organizations:
+            organizations[repo_owner] = {
+                'id': nerv_id("ORG", repo_owner),
+                'repos': [],
+                'total_open_prs': 0,
+                'total_open_issues': 0,
+                'last_updated': repo_stats['last_updated']
+            }
+        org = organizations[repo_owner]
+        org['repos'].append({
+            'name': project,
+            'id': nerv_id("PRJ", project),
+            'stats': repo_stats
+        })
+
+        # Update organization totals
+        org['total_open_prs'] += repo_stats['open_prs']
+        org['total_open_issues'] += repo_stats['open_issues']
+
+        # Update organization's last updated time if this repo is more recent
+        if repo_stats['last_updated'] != 'N/A' and (
+            org['last_updated'] == 'N/A' or repo_stats['last_updated'] > org['last_updated']
+        ):
+            org['last_updated'] = repo_stats['last_updated']
+    return organizations
+
+
+def repository_weeks(week_dirs):
+    """Week folders (newest first) with a readable date range for the repository page."""
+    weeks = []
+    for week_dir in week_dirs:
+        # Format is YYYYMMDD_YYYYMMDD
+        if '_' in week_dir and len(week_dir) == 17:  # 8 + 1 + 8
+            start_date = week_dir[:8]
+            end_date = week_dir[9:]
+            formatted_date = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:]} to {end_date[:4]}-{end_date[4:6]}-{end_date[6:]}"
+        else:
+            formatted_date = week_dir
+        weeks.append({
+            'dir': week_dir,
+            'formatted_date': formatted_date
+        })
+    return weeks
+
+
+# ====================== Render jobs ========================
+# A job is a plain dict: template, output path, the inputs the page is a
+# function of, and either a ready context or the location of a report's data.
+def report_job(report_dir, repo, week, page):
+    """Job for a weekly report; ``page`` is the render info kept in the catalog."""
+    return {
+        'template': 'report.html',
+        'output': f'{report_dir}/{repo}/{week}/data.html',
+        'inputs': page,
+        'report': {
+            'stem': f'{report_dir}/{repo}/{week}/data',
+            'repo_owner': page['repo_owner'],
+            'repo': repo,
+            'glow_color': page['glow_color'],
+            'logo_url': page['logo_url'],
+        },
+    }
+
+
+def page_job(template, output, **context):
+    return {
+        'template': template,
+        'output': output,
+        'inputs': {k: v for k, v in context.items() if k not in VOLATILE_CONTEXT},
+        'context': context,
+    }
+
+
+def job_context(job):
+    if 'report' in job:
+        args = dict(job['report'])
+        return report_context(report_io.load(args.pop('stem')), **args)
+    return job['context']
+
+
+_worker_renderer = None
+
+
+def _init_worker(site_root, template_dir):
+    global _worker_renderer
+    _worker_renderer = SiteRenderer(site_root, template_dir)
+
+
+def _render_in_worker(job):
+    _worker_renderer.write(job['template'], job['output'], job_context(job))
+    return job['output']
+
+
+def render_jobs(site, jobs, workers=None):
+    """Render the stale pages among ``jobs`` on a pool of ``workers`` processes.
+
+    Up-to-date pages are skipped in this process using ``site``'s manifest;
+    only the remaining jobs are shipped to the workers, which rebuild each
+    context from the job alone. Returns the number of pages written.
+    """
+    pending = []
+    for job in jobs:
+        fingerprint = site.stale(job['template'], job['output'], job['inputs'])
+        if fingerprint is not None:
+            pending.append((job, fingerprint))
+    if not pending:
+        return 0
+
+    site.assets()  # written once here rather than raced for by every worker
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    if workers == 1 or len(pending) == 1:
+        for job, fingerprint in pending:
+            try:
+                site.write(job['template'], job['output'], job_context(job))
+            except Exception as e:
+                print(f"Error rendering {job['output']}: {e}")
+                continue
+            site.mark_written(job['output'], fingerprint)
+            written += 1
+        return written
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_worker,
+                             initargs=(site.site_root, site.template_dir)) as pool:
+        futures = {pool.submit(_render_in_worker, job): (job, fingerprint) for job, fingerprint in pending}
+        for future in as_completed(futures):
+            job, fingerprint = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error rendering {job['output']}: {e}")
+                continue
+            site.mark_written(job['output'], fingerprint)
+            written += 1
+    return written
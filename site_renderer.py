@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from file_lock import atomic_write, locked
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Source files concatenated into each bundle, in order
+BUNDLES = {
+    'site.css': ('nerv.css', 'report.css'),
+    'site.js': ('relative_time.js', 'report.js'),
+}
+PAGE_TEMPLATES = ('index.html', 'organization.html', 'repository.html', 'report.html', 'run_profile.html')
+# Context keys that change on every run without changing what a page shows
+VOLATILE_CONTEXT = ('generated_at',)
+
+
+def template_version(template_dir):
+    """Hash of every template and asset source; any edit invalidates all pages."""
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(template_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            digest.update(os.path.relpath(path, template_dir).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SiteRenderer:
+    """Renders every HTML page of the site from precompiled Jinja templates.
+
+    Pages no longer inline their stylesheet: the CSS and JS under
+    ``templates/assets`` are concatenated into one bundle each and written to
+    ``<site_root>/assets`` under a content-hashed name, so browsers can cache
+    them indefinitely across all pages. Templates are compiled once when the
+    renderer is created and reused for every page.
+
+    With a ``manifest_path``, each output page records the hash of its inputs
+    and of the templates. A page whose inputs did not change since it was last
+    written is skipped; ``force`` rebuilds everything. Saving merges this
+    run's pages into the manifest on disk, so concurrent ``--shard`` runs
+    keep each other's entries.
+    """
+
+    def __init__(self, site_root='.', template_dir=TEMPLATE_DIR, manifest_path=None, force=False):
+        self.site_root = site_root
+        self.template_dir = template_dir
+        self.manifest_path = manifest_path
+        self.force = force
+        self.version = template_version(template_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            cache_size=-1,
+        )
+        self.templates = {name: self.env.get_template(name) for name in PAGE_TEMPLATES}
+        self._lock = threading.Lock()
+        self._assets = None
+        self.stats = {'rebuilt': 0, 'skipped': 0}
+
+        # output path -> fingerprint of the inputs it was last rendered from
+        self._manifest = self._read_manifest() if manifest_path else {}
+        # output paths rendered by this process, merged into the manifest on save
+        self._rendered = set()
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable build manifest {self.manifest_path}: {e}")
+            return {}
+
+    def assets(self):
+        """Write the hashed bundles (once per run) and return name -> path relative to the site root."""
+        with self._lock:
+            if self._assets is None:
+                self._assets = {name: self._write_bundle(name, parts) for name, parts in BUNDLES.items()}
+            return self._assets
+
+    def _write_bundle(self, name, parts):
+        content = b''
+        for part in parts:
+            with open(os.path.join(self.template_dir, 'assets', part), 'rb') as f:
+                content += f.read().rstrip(b'\n') + b'\n\n'
+        stem, ext = os.path.splitext(name)
+        rel_path = f'assets/{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+        path = os.path.join(self.site_root, rel_path)
+        # Older bundles are kept: pages of earlier weeks that are not re-rendered still reference them
+        if not os.path.exists(path):
+            atomic_write(path, content)
+        return rel_path
+
+    def fingerprint(self, template, inputs):
+        material = json.dumps([self.version, template, inputs], sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def render(self, template, output_path, inputs=None, context_factory=None, **context):
+        """Render ``template`` to ``output_path`` (relative to the site root) unless it is up to date.
+
+        ``inputs`` is any JSON value the page is a function of; it defaults to
+        the context without volatile keys. ``context_factory`` builds the
+        context lazily, so work is only done for pages that are rebuilt.
+        Returns True if the page was written.
+        """
+        if inputs is None:
+            inputs = {k: v for k, v in context.items() if k not in VOLATILE_CONTEXT}
+        fingerprint = self.stale(template, output_path, inputs)
+        if fingerprint is None:
+            return False
+        if context_factory is not None:
+            context.update(context_factory())
+        self.write(template, output_path, context)
+        self.mark_written(output_path, fingerprint)
+        return True
+
+    def stale(self, template, output_path, inputs):
+        """Fingerprint of the page if it has to be (re)built, None if it is up to date (counted as skipped)."""
+        fingerprint = self.fingerprint(template, inputs)
+        with self._lock:
+            if (not self.force and self._manifest.get(output_path) == fingerprint
+                    and os.path.exists(os.path.join(self.site_root, output_path))):
+                self.stats['skipped'] += 1
+                return None
+        return fingerprint
+
+    def write(self, template, output_path, context):
+        """Render ``template`` with ``context`` to ``output_path``, without consulting the manifest."""
+        prefix = os.path.relpath('.', os.path.dirname(output_path) or '.').replace(os.sep, '/')
+        prefix = '' if prefix == '.' else prefix + '/'
+        html = self.templates[template].render(
+            assets={name: prefix + rel for name, rel in self.assets().items()},
+            root=prefix,
+            **context,
+        )
+        with open(os.path.join(self.site_root, output_path), 'w') as f:
+            f.write(html)
+
+    def mark_written(self, output_path, fingerprint):
+        """Record a page written by :meth:`write` (possibly in another process) in the manifest."""
+        with self._lock:
+            self._manifest[output_path] = fingerprint
+            self._rendered.add(output_path)
+            self.stats['rebuilt'] += 1
+
+    def save_manifest(self):
+        if not self.manifest_path:
+            return
+        with self._lock, locked(self.manifest_path):
+            manifest = self._read_manifest()
+            manifest.update((path, self._manifest[path]) for path in self._rendered)
+            atomic_write(self.manifest_path, json.dumps(manifest))
+            self._manifest = manifest
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+        print(f"\n🏗  Site: {st['rebuilt']} pages rebuilt, {st['skipped']} unchanged pages skipped")
@@ -0,0 +1,53 @@
+import threading
+
+
+class SubresourceMemo:
+    """Per-run memo of PR/issue sub-resources (comments, reviews, ...).
+
+    Entries are keyed by ``(repo, kind, number, updated_at)`` so every consumer
+    (enrichment, counts, rendering) shares a single fetch per item version.
+    Concurrent requests for the same key wait for the first fetch instead of
+    issuing their own. ``stats['avoided']`` counts the requests saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._pending = {}
+        self.stats = {'fetched': 0, 'avoided': 0}
+
+    def get(self, key, loader):
+        """Return the value for ``key``, calling ``loader()`` only the first time."""
+        with self._lock:
+            if key in self._values:
+                self.stats['avoided'] += 1
+                return self._values[key]
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._values:
+                    self.stats['avoided'] += 1
+                    return self._values[key]
+            # The first fetch failed; try again ourselves
+            return self.get(key, loader)
+
+        try:
+            value = loader()
+            with self._lock:
+                self._values[key] = value
+                self.stats['fetched'] += 1
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+
+    def print_stats(self):
+        with self._lock:
+            st = dict(self.stats)
+        print(f"\n🧠 Sub-resource memo: {st['fetched']} fetched, {st['avoided']} requests avoided")
@@ -10,8 +10,9 @@ import sys
 from telethon.sync import TelegramClient
 from telethon.tl.functions.messages import GetDialogsRequest
 import re
-import json
 from collections import defaultdict
+from llm_cache import LLMCache
+import report_io
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,6 +31,16 @@ OPENAI_API_KEY = os.getenv("OPENAI_KEY")
 DAYS_TO_FETCH = 7  # Default to last 7 days of messages
 MESSAGE_LIMIT = 2000  # Significantly increased to get more messages
 
+# Summaries are cached by hash of model, prompt, parameters and prompt version;
+# set LLM_CACHE_BYPASS=1 to query the model anyway
+llm_cache = LLMCache(os.getenv("LLM_CACHE_DIR", ".cache/llm"),
+                     max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024,
+                     bypass=os.getenv("LLM_CACHE_BYPASS", "") not in ("", "0"))
+# Bump after editing the summary prompt so cached summaries are not reused
+PROMPT_VERSION = 1
+# Serialization of the raw message export: json, json-indent, json.gz, json.zst or msgpack
+REPORT_FORMAT = os.getenv("REPORT_FORMAT", "json")
+
 # Define the output directory for reports
 REPORTS_DIR = "reports"
 
@@ -175,8 +186,7 @@ with Client("session_name", api_id=TELEGRAM_API_ID, api_hash=TELEGRAM_API_HASH)
             print(f"Messages by day: {dict(daily_message_count)}")
             
             # Export raw messages to JSON
-            json_filename = f"{chat_title.replace(' ', '_')}_{chat_id_formatted}_raw.json"
-            json_filepath = os.path.join(REPORTS_DIR, json_filename)
+            json_stem = os.path.join(REPORTS_DIR, f"{chat_title.replace(' ', '_')}_{chat_id_formatted}_raw")
             
             # Add metadata to the JSON export
             json_data = {
@@ -192,9 +202,8 @@ with Client("session_name", api_id=TELEGRAM_API_ID, api_hash=TELEGRAM_API_HASH)
                 'messages': raw_messages
             }
             
-            # Write JSON data to file
-            with open(json_filepath, 'w', encoding='utf-8') as json_file:
-                json.dump(json_data, json_file, ensure_ascii=False, indent=2)
+            # Write the export in the configured format (offline_telegram_summary.py reads any of them)
+            json_filepath = report_io.dump(json_data, json_stem, REPORT_FORMAT)
             
             print(f"Raw message data exported to: {json_filepath}")
             
@@ -265,19 +274,26 @@ with Client("session_name", api_id=TELEGRAM_API_ID, api_hash=TELEGRAM_API_HASH)
                 {message_text}
                 """
                 
-                print("Sending chat to OpenAI for summarization...")
-                response = openai_client.chat.completions.create(
-                    model="gpt-4-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that summarizes conversations clearly and concisely. Always structure your response with clear headings and organization."},
-                        {"role": "user", "content": summary_prompt}
-                    ],
+                summary_messages = [
+                    {"role": "system", "content": "You are a helpful assistant that summarizes conversations clearly and concisely. Always structure your response with clear headings and organization."},
+                    {"role": "user", "content": summary_prompt}
+                ]
+                summary_params = dict(
                     max_tokens=1000,  # Increased for more detailed summaries
                     temperature=0.3
                 )
                 
+                def request_summary():
+                    print("Sending chat to OpenAI for summarization...")
+                    response = openai_client.chat.completions.create(
+                        model="gpt-4-turbo", messages=summary_messages, **summary_params
+                    )
+                    return response.choices[0].message.content
+                
                 # Extract summary
-                summary = response.choices[0].message.content.strip()
+                summary = llm_cache.complete(
+                    "gpt-4-turbo", summary_messages, summary_params, PROMPT_VERSION, request_summary
+                ).strip()
                 print("Summary received from OpenAI")
                 
                 # Process the summary to extract sections and convert line breaks to HTML
@@ -1069,4 +1085,5 @@ index_html += """
 # Write the index HTML file
 with open("telegram_reports_index.html", "w", encoding="utf-8") as f:
     f.write(index_html)
-print("Index page created: telegram_reports_index.html") 
\ No newline at end of file
+print("Index page created: telegram_reports_index.html")
+llm_cache.print_stats()
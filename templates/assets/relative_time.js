@@ -0,0 +1,11 @@
+/* Shows <time class="ago"> timestamps relative to now, so pages need no rebuild as time passes */
+document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('time.ago').forEach(function (el) {
+        const then = new Date(el.getAttribute('datetime'));
+        if (isNaN(then)) {
+            return;
+        }
+        el.title = el.textContent;
+        el.textContent = Math.max(0, Math.round((Date.now() - then) / 3600000)) + 'h ago';
+    });
+});
@@ -0,0 +1,79 @@
+/* Weekly Activity chart of the report pages; reads its series from #weekly-activity */
+document.addEventListener('DOMContentLoaded', function () {
+    const canvas = document.getElementById('weeklyGraph');
+    const source = document.getElementById('weekly-activity');
+    if (!canvas || !source || typeof Chart === 'undefined') {
+        return;
+    }
+    const activity = JSON.parse(source.textContent);
+
+    function series(label, data, rgb) {
+        return {
+            label: label,
+            data: data,
+            borderColor: 'rgba(' + rgb + ', 1)',
+            backgroundColor: 'rgba(' + rgb + ', 0.1)',
+            borderWidth: 3,
+            tension: 0.4,
+            fill: true,
+            pointRadius: 4,
+            pointHoverRadius: 6
+        };
+    }
+
+    new Chart(canvas.getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: activity.labels,
+            datasets: [
+                series('PRs Closed', activity.prs_closed, '255, 99, 132'),
+                series('Issues Closed', activity.issues_closed, '54, 162, 235'),
+                series('Contributors', activity.contributors, '75, 192, 192')
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    position: 'top',
+                    labels: {
+                        boxWidth: 15,
+                        padding: 15,
+                        font: {
+                            size: 12
+                        }
+                    }
+                },
+                tooltip: {
+                    backgroundColor: 'rgba(0, 0, 0, 0.7)',
+                    padding: 10,
+                    cornerRadius: 4,
+                    titleFont: {
+                        size: 14
+                    },
+                    bodyFont: {
+                        size: 14
+                    }
+                }
+            },
+            animation: {
+                duration: 2000,
+                easing: 'easeOutQuart'
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    grid: {
+                        color: 'rgba(0, 0, 0, 0.05)'
+                    }
+                },
+                x: {
+                    grid: {
+                        display: false
+                    }
+                }
+            }
+        }
+    });
+});
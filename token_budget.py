@@ -0,0 +1,37 @@
+import math
+
+# Rough average for English/code text with OpenAI tokenizers; errs on the high side
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Estimated token count of ``text`` without calling a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text, budget):
+    """Cut ``text`` to roughly ``budget`` tokens, marking the cut."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:max(0, limit - 3)] + '...'
+
+
+def chunk_lines(lines, budget):
+    """Group ``lines`` into consecutive chunks of at most ``budget`` estimated tokens.
+
+    Order is kept. A single line larger than the budget is truncated so that
+    every chunk fits.
+    """
+    chunks, current, used = [], [], 0
+    for line in lines:
+        line = truncate_to_tokens(line, budget)
+        cost = estimate_tokens(line) + 1  # newline separator
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,61 @@
+import threading
+
+from rate_limit import RateLimitScheduler
+
+
+class TokenPool:
+    """A set of GitHub tokens, each with its own rate limit scheduler.
+
+    Every request is routed to the token with the most remaining budget for
+    the resource it targets; ties (for example before any budget is known)
+    go to the token with the fewest requests in flight, which spreads
+    concurrent repo workers across tokens.
+    """
+
+    def __init__(self, tokens, scheduler_factory=RateLimitScheduler):
+        tokens = [t for t in tokens if t]
+        self.tokens = tokens or [None]
+        self.schedulers = {t: scheduler_factory() for t in self.tokens}
+
+        self._lock = threading.Lock()
+        self.in_flight = {t: 0 for t in self.tokens}
+        self.calls = {t: 0 for t in self.tokens}
+
+    def _budget(self, token, resource):
+        remaining = self.schedulers[token].remaining(resource)
+        return float('inf') if remaining is None else remaining
+
+    def checkout(self, resource='core'):
+        """Pick the token for the next ``resource`` request and mark it in flight."""
+        with self._lock:
+            token = max(self.tokens, key=lambda t: (self._budget(t, resource), -self.in_flight[t]))
+            self.in_flight[token] += 1
+            self.calls[token] += 1
+        return token
+
+    def has_spare(self, resource, exclude):
+        """True if a token other than ``exclude`` still has budget for ``resource``."""
+        with self._lock:
+            return any(self._budget(t, resource) > self.schedulers[t].reserve
+                       for t in self.tokens if t != exclude)
+
+    def release(self, token):
+        with self._lock:
+            self.in_flight[token] -= 1
+
+    @staticmethod
+    def label(token):
+        return f"token …{token[-4:]}" if token else "anonymous"
+
+    def print_stats(self):
+        """Print per-token call counts, rate limit events and remaining budget."""
+        print(f"\n🔑 Token usage ({len(self.tokens)} token(s)):")
+        for token in self.tokens:
+            scheduler = self.schedulers[token]
+            with self._lock:
+                calls = self.calls[token]
+            remaining = scheduler.remaining('core')
+            print(f"  - {self.label(token)}: {calls} requests, "
+                  f"{scheduler.stats['rate_limited']} rate-limited, "
+                  f"{scheduler.stats['waited_seconds']:.0f}s waiting, "
+                  f"core remaining: {remaining if remaining is not None else 'unknown'}")